@@ -9,12 +9,13 @@ import hashlib
 import hmac
 import os
 import sqlite3
-import time
+import threading
 from contextlib import contextmanager
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -26,15 +27,20 @@ DEFAULT_ADMIN_PASSWORD = "admin1234"
 PASSWORD_ITERATIONS = 200_000
 
 
-def get_setting(key: str, default: str) -> str:
-    if key in os.environ and os.environ[key]:
-        return os.environ[key]
+def _load_secrets() -> Dict[str, Any]:
     try:
-        if key in st.secrets and st.secrets[key]:
-            return str(st.secrets[key])
+        return dict(st.secrets)
     except Exception:
-        pass
-    return default
+        return {}
+
+
+# Snapshot secrets.toml once per script run instead of going through st.secrets for every setting.
+_SECRETS = _load_secrets()
+
+
+def get_setting(key: str, default: str) -> str:
+    value = os.environ.get(key) or _SECRETS.get(key)
+    return str(value) if value else default
 
 
 DB_PATH = Path(get_setting("BOOK_TRACKER_DB", str(DEFAULT_DB))).expanduser()
@@ -95,15 +101,60 @@ def can_self_signup(email: str, invite_code: str) -> Tuple[bool, str]:
     return True, ""
 
 
+def _convert_timestamp(value: bytes) -> Union[datetime, str]:
+    text = value.decode("utf-8")
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        # Older CSV imports stored timestamps verbatim; keep them rather than dropping them.
+        return text
+    if parsed.tzinfo is not None:
+        # App timestamps are naive UTC; imported values may carry an offset or "Z".
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# Session timestamps are stored as ISO-8601 text; columns declared or aliased as
+# "[timestamp]" come back from the driver as datetime objects, anything unparseable as-is.
+sqlite3.register_converter("timestamp", _convert_timestamp)
+
+
 @st.cache_resource(show_spinner=False)
 def get_connection() -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn = sqlite3.connect(
+        DB_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        check_same_thread=False,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL + synchronous=NORMAL avoids an fsync per commit; mmap/cache keep hot pages in memory.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -20000")
     return conn
 
 
+@st.cache_resource(show_spinner=False)
+def _db_state() -> Dict[str, Any]:
+    return {"version": 0, "lock": threading.Lock()}
+
+
+def _db_version() -> int:
+    return _db_state()["version"]
+
+
+def _bump() -> None:
+    # Invalidates every cached reader keyed on the version counter. The lock gives
+    # concurrent writers from different sessions distinct versions.
+    state = _db_state()
+    with state["lock"]:
+        state["version"] += 1
+
+
 @contextmanager
 def get_cursor():
     conn = get_connection()
@@ -118,6 +169,16 @@ def get_cursor():
         cur.close()
 
 
+def execute(sql: str, params: Tuple[Any, ...] = ()) -> sqlite3.Cursor:
+    """Run a single statement in its own transaction; use get_cursor for multi-statement work."""
+    with get_connection() as conn:
+        return conn.execute(sql, params)
+
+
+def fetch_df(sql: str, params: Tuple[Any, ...] = ()) -> pd.DataFrame:
+    return pd.read_sql(sql, get_connection(), params=params)
+
+
 def table_exists(table_name: str) -> bool:
     with get_cursor() as cur:
         cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table_name,))
@@ -137,15 +198,14 @@ def create_user(
     is_active: int = 1,
     created_by: Optional[int] = None,
 ) -> int:
-    with get_cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO users (email, password_hash, role, is_active, created_at, created_by, last_login_at)
-            VALUES (?, ?, ?, ?, ?, ?, NULL)
-            """,
-            (email.lower().strip(), _hash_password(password), role, is_active, _utc_now(), created_by),
-        )
-        return int(cur.lastrowid)
+    cur = execute(
+        """
+        INSERT INTO users (email, password_hash, role, is_active, created_at, created_by, last_login_at)
+        VALUES (?, ?, ?, ?, ?, ?, NULL)
+        """,
+        (email.lower().strip(), _hash_password(password), role, is_active, _utc_now(), created_by),
+    )
+    return int(cur.lastrowid)
 
 
 def fetch_user_by_email(email: str) -> Optional[sqlite3.Row]:
@@ -206,12 +266,11 @@ def reset_user_password(target_user_id: int, new_password: str) -> bool:
     clean = (new_password or "").strip()
     if not clean:
         return False
-    with get_cursor() as cur:
-        cur.execute(
-            "UPDATE users SET password_hash = ? WHERE id = ?",
-            (_hash_password(clean), target_user_id),
-        )
-        return cur.rowcount > 0
+    cur = execute(
+        "UPDATE users SET password_hash = ? WHERE id = ?",
+        (_hash_password(clean), target_user_id),
+    )
+    return cur.rowcount > 0
 
 
 def fetch_user_books_for_admin(target_user_id: int, limit: int = 20) -> List[sqlite3.Row]:
@@ -234,8 +293,8 @@ def fetch_user_sessions_for_admin(target_user_id: int, limit: int = 20) -> List[
         cur.execute(
             """
             SELECT
-                s.start_ts,
-                s.end_ts,
+                s.start_ts AS "start_ts [timestamp]",
+                s.end_ts AS "end_ts [timestamp]",
                 s.start_page,
                 s.end_page,
                 s.pages_read,
@@ -337,6 +396,7 @@ def migrate_legacy_schema(admin_user_id: int) -> None:
         cur.execute("UPDATE sessions SET user_id = ? WHERE user_id IS NULL", (admin_user_id,))
 
 
+@st.cache_resource(show_spinner=False)
 def init_db() -> Dict[str, Any]:
     with get_cursor() as cur:
         cur.execute(
@@ -376,8 +436,8 @@ def init_db() -> Dict[str, Any]:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER,
                 book_id INTEGER NOT NULL,
-                start_ts TEXT NOT NULL,
-                end_ts TEXT NOT NULL,
+                start_ts TIMESTAMP NOT NULL,
+                end_ts TIMESTAMP NOT NULL,
                 start_page INTEGER,
                 end_page INTEGER,
                 pages_read INTEGER DEFAULT 0,
@@ -418,6 +478,9 @@ def init_db() -> Dict[str, Any]:
         cur.execute("CREATE INDEX IF NOT EXISTS idx_books_user_id ON books(user_id)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_session_quotes_session_id ON session_quotes(session_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_start_ts ON sessions(start_ts DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_book_id ON sessions(book_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_books_shelf ON books(shelf)")
 
     if not column_exists("users", "created_by"):
         with get_cursor() as cur:
@@ -490,48 +553,45 @@ def init_db() -> Dict[str, Any]:
 
 
 def seed_data(user_id: int) -> None:
+    now = _utc_now()
+    start = (datetime.utcnow() - timedelta(hours=1)).isoformat(timespec="seconds")
     with get_cursor() as cur:
-        cur.execute("SELECT COUNT(*) FROM books WHERE user_id = ?", (user_id,))
-        if cur.fetchone()[0] == 0:
-            now = _utc_now()
-            sample_books = [
-                (user_id, "Atomic Habits", "James Clear", "9780735211292", 320, 25, "reading", now),
-                (user_id, "Project Hail Mary", "Andy Weir", "9780593135204", 496, 0, "to_read", now),
-                (user_id, "The Pragmatic Programmer", "Andrew Hunt", "9780201616224", 352, 352, "finished", now),
-            ]
-            cur.executemany(
-                """
-                INSERT INTO books (user_id, title, author, isbn, total_pages, current_page, shelf, added_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                sample_books,
+        cur.execute(
+            """
+            INSERT INTO books (user_id, title, author, isbn, total_pages, current_page, shelf, added_at)
+            SELECT ?, column1, column2, column3, column4, column5, column6, ?
+            FROM (
+                VALUES
+                    ('Atomic Habits', 'James Clear', '9780735211292', 320, 25, 'reading'),
+                    ('Project Hail Mary', 'Andy Weir', '9780593135204', 496, 0, 'to_read'),
+                    ('The Pragmatic Programmer', 'Andrew Hunt', '9780201616224', 352, 352, 'finished')
             )
-
-        cur.execute("SELECT COUNT(*) FROM sessions WHERE user_id = ?", (user_id,))
-        if cur.fetchone()[0] == 0:
-            cur.execute("SELECT id FROM books WHERE user_id = ? AND title = ?", (user_id, "Atomic Habits"))
-            row = cur.fetchone()
-            if row:
-                book_id = row[0]
-                start = datetime.utcnow() - timedelta(hours=1)
-                end = datetime.utcnow()
-                cur.execute(
-                    """
-                    INSERT INTO sessions (user_id, book_id, start_ts, end_ts, pages_read, note)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (user_id, book_id, start.isoformat(timespec="seconds"), end.isoformat(timespec="seconds"), 25, "Morning session"),
-                )
-
-        cur.execute("SELECT COUNT(*) FROM goals WHERE user_id = ?", (user_id,))
-        if cur.fetchone()[0] == 0:
+            WHERE NOT EXISTS (SELECT 1 FROM books WHERE user_id = ?)
+            RETURNING id, title
+            """,
+            (user_id, now, user_id),
+        )
+        seeded_books = {row["title"]: int(row["id"]) for row in cur.fetchall()}
+        seeded = bool(seeded_books)
+        if "Atomic Habits" in seeded_books:
             cur.execute(
                 """
-                INSERT INTO goals (user_id, year, daily_minutes, yearly_books)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO sessions (user_id, book_id, start_ts, end_ts, pages_read, note)
+                SELECT ?, ?, ?, ?, 25, 'Morning session'
+                WHERE NOT EXISTS (SELECT 1 FROM sessions WHERE user_id = ?)
                 """,
-                (user_id, datetime.utcnow().year, 30, 24),
+                (user_id, seeded_books["Atomic Habits"], start, now, user_id),
             )
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO goals (user_id, year, daily_minutes, yearly_books)
+            VALUES (?, ?, ?, ?)
+            """,
+            (user_id, datetime.utcnow().year, 30, 24),
+        )
+        seeded = seeded or cur.rowcount > 0
+    if seeded:
+        _bump()
 
 
 def authenticate(email: str, password: str) -> Optional[sqlite3.Row]:
@@ -542,36 +602,59 @@ def authenticate(email: str, password: str) -> Optional[sqlite3.Row]:
         return None
     if not _verify_password(user["password_hash"], password):
         return None
-    with get_cursor() as cur:
-        cur.execute("UPDATE users SET last_login_at = ? WHERE id = ?", (_utc_now(), user["id"]))
+    execute("UPDATE users SET last_login_at = ? WHERE id = ?", (_utc_now(), user["id"]))
     return user
 
 
-def fetch_books(user: sqlite3.Row, order_by: str = "title") -> List[sqlite3.Row]:
-    valid_columns = {"title", "author", "added_at", "shelf"}
-    column = order_by if order_by in valid_columns else "title"
+_BOOKS_SELECT = """
+    SELECT b.*, u.email AS owner_email
+    FROM books b
+    JOIN users u ON u.id = b.user_id
+"""
+# One fixed statement per sortable column, so the ORDER BY never carries caller input
+# and each text maps onto a single entry in sqlite3's per-connection statement cache.
+_FETCH_BOOKS_SQL = {
+    column: f"{_BOOKS_SELECT} ORDER BY {column} COLLATE NOCASE"
+    for column in ("title", "author", "added_at", "shelf")
+}
+_FETCH_USER_BOOKS_SQL = {
+    column: f"{_BOOKS_SELECT} WHERE b.user_id = ? ORDER BY {column} COLLATE NOCASE"
+    for column in _FETCH_BOOKS_SQL
+}
+
+
+def fetch_books(user: sqlite3.Row, order_by: str = "title") -> pd.DataFrame:
+    column = order_by if order_by in _FETCH_BOOKS_SQL else "title"
+    return _fetch_books_cached(int(user["id"]), user["role"] == "admin", column, _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_books_cached(user_id: int, is_admin: bool, column: str, version: int) -> pd.DataFrame:
+    if is_admin:
+        return fetch_df(_FETCH_BOOKS_SQL[column])
+    return fetch_df(_FETCH_USER_BOOKS_SQL[column], (user_id,))
+
+
+def book_label_index(user: sqlite3.Row) -> Dict[str, int]:
+    return _book_label_index_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _book_label_index_cached(user_id: int, is_admin: bool, version: int) -> Dict[str, int]:
+    # Only ids are cached; callers load the full row with fetch_book_by_id when needed.
+    sql = """
+        SELECT b.id, b.title || ' - ' || b.author || ' (' || u.email || ')' AS label
+        FROM books b
+        JOIN users u ON u.id = b.user_id
+    """
+    params: Tuple[Any, ...] = ()
+    if not is_admin:
+        sql += " WHERE b.user_id = ?"
+        params = (user_id,)
+    sql += " ORDER BY b.title COLLATE NOCASE"
     with get_cursor() as cur:
-        if user["role"] == "admin":
-            cur.execute(
-                f"""
-                SELECT b.*, u.email AS owner_email
-                FROM books b
-                JOIN users u ON u.id = b.user_id
-                ORDER BY {column} COLLATE NOCASE
-                """
-            )
-        else:
-            cur.execute(
-                f"""
-                SELECT b.*, u.email AS owner_email
-                FROM books b
-                JOIN users u ON u.id = b.user_id
-                WHERE b.user_id = ?
-                ORDER BY {column} COLLATE NOCASE
-                """,
-                (user["id"],),
-            )
-        return cur.fetchall()
+        cur.execute(sql, params)
+        return {row["label"]: int(row["id"]) for row in cur.fetchall()}
 
 
 def fetch_book_by_id(user: sqlite3.Row, book_id: int) -> Optional[sqlite3.Row]:
@@ -612,23 +695,39 @@ def insert_book(user: sqlite3.Row, data: Dict[str, Any]) -> None:
         if current_page > total_pages:
             current_page = total_pages
 
+    execute(
+        """
+        INSERT INTO books (user_id, title, author, isbn, total_pages, current_page, shelf, added_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            user["id"],
+            data["title"],
+            data["author"],
+            data.get("isbn"),
+            total_pages,
+            current_page,
+            data.get("shelf", "to_read"),
+            _utc_now(),
+        ),
+    )
+    _bump()
+
+
+def insert_books_bulk(records: List[Tuple[Any, ...]]) -> int:
+    """Insert pre-normalised (user_id, title, author, isbn, total_pages, current_page, shelf, added_at) rows."""
+    if not records:
+        return 0
     with get_cursor() as cur:
-        cur.execute(
+        cur.executemany(
             """
             INSERT INTO books (user_id, title, author, isbn, total_pages, current_page, shelf, added_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                user["id"],
-                data["title"],
-                data["author"],
-                data.get("isbn"),
-                total_pages,
-                current_page,
-                data.get("shelf", "to_read"),
-                _utc_now(),
-            ),
+            records,
         )
+    _bump()
+    return len(records)
 
 
 def update_book(user: sqlite3.Row, book_id: int, data: Dict[str, Any]) -> bool:
@@ -690,22 +789,50 @@ def update_book(user: sqlite3.Row, book_id: int, data: Dict[str, Any]) -> bool:
                     """,
                     (total_pages, total_pages, book_id, user["id"]),
                 )
-        return updated
+    _bump()
+    return updated
 
 
 def remove_book(user: sqlite3.Row, book_id: int) -> bool:
-    with get_cursor() as cur:
-        if user["role"] == "admin":
-            cur.execute("DELETE FROM books WHERE id = ?", (book_id,))
-        else:
-            cur.execute("DELETE FROM books WHERE id = ? AND user_id = ?", (book_id, user["id"]))
-        return cur.rowcount > 0
+    if user["role"] == "admin":
+        cur = execute("DELETE FROM books WHERE id = ?", (book_id,))
+    else:
+        cur = execute("DELETE FROM books WHERE id = ? AND user_id = ?", (book_id, user["id"]))
+    removed = cur.rowcount > 0
+    _bump()
+    return removed
 
 
-def fetch_sessions(user: sqlite3.Row, limit: Optional[int] = None) -> List[sqlite3.Row]:
-    sql = """
+def fetch_sessions(user: sqlite3.Row, limit: Optional[int] = None) -> pd.DataFrame:
+    return _fetch_sessions_cached(int(user["id"]), user["role"] == "admin", int(limit or 0), _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_sessions_cached(user_id: int, is_admin: bool, limit: int, version: int) -> pd.DataFrame:
+    return fetch_df(*_sessions_query(user_id, is_admin, limit))
+
+
+def _sessions_query(
+    user_id: int, is_admin: bool, limit: int = 0, raw_timestamps: bool = False
+) -> Tuple[str, Tuple[Any, ...]]:
+    # CAST drops the declared TIMESTAMP type, so the driver hands back the stored text untouched.
+    if raw_timestamps:
+        ts_columns = "CAST(s.start_ts AS TEXT) AS start_ts, CAST(s.end_ts AS TEXT) AS end_ts"
+    else:
+        ts_columns = 's.start_ts AS "start_ts [timestamp]", s.end_ts AS "end_ts [timestamp]"'
+    sql = f"""
         SELECT
-            s.*,
+            s.id,
+            s.user_id,
+            s.book_id,
+            {ts_columns},
+            s.start_page,
+            s.end_page,
+            s.pages_read,
+            s.note,
+            s.quote_page,
+            s.quote_line,
+            s.quote_text,
             b.title,
             b.author,
             u.email AS owner_email,
@@ -731,16 +858,110 @@ def fetch_sessions(user: sqlite3.Row, limit: Optional[int] = None) -> List[sqlit
         ) q ON q.session_id = s.id
     """
     params: List[Any] = []
-    if user["role"] != "admin":
+    if not is_admin:
         sql += " WHERE s.user_id = ?"
-        params.append(user["id"])
-    sql += " ORDER BY start_ts DESC"
+        params.append(user_id)
+    sql += " ORDER BY s.start_ts DESC"
     if limit:
         sql += " LIMIT ?"
-        params.append(int(limit))
+        params.append(limit)
+    return sql, tuple(params)
+
+
+def fetch_totals(user: sqlite3.Row) -> Dict[str, Any]:
+    return _fetch_totals_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_totals_cached(user_id: int, is_admin: bool, version: int) -> Dict[str, Any]:
+    where = "" if is_admin else " WHERE user_id = ?"
+    params = () if is_admin else (user_id,)
     with get_cursor() as cur:
-        cur.execute(sql, tuple(params))
-        return cur.fetchall()
+        cur.execute(
+            f"""
+            SELECT
+                COUNT(*) AS books_count,
+                COALESCE(SUM(CASE WHEN shelf = 'reading' THEN 1 ELSE 0 END), 0) AS reading_count,
+                COALESCE(SUM(CASE WHEN shelf = 'finished' THEN 1 ELSE 0 END), 0) AS finished_count
+            FROM books{where}
+            """,
+            params,
+        )
+        book_row = cur.fetchone()
+        cur.execute(
+            f"""
+            SELECT
+                COUNT(*) AS sessions_count,
+                COALESCE(SUM(COALESCE(pages_read, 0)), 0) AS pages_logged,
+                COALESCE(SUM((julianday(end_ts) - julianday(start_ts)) * 24.0), 0.0) AS hours_logged
+            FROM sessions{where}
+            """,
+            params,
+        )
+        session_row = cur.fetchone()
+    return {**dict(book_row), **dict(session_row)}
+
+
+def fetch_shelf_counts(user: sqlite3.Row) -> Dict[str, int]:
+    return _fetch_shelf_counts_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_shelf_counts_cached(user_id: int, is_admin: bool, version: int) -> Dict[str, int]:
+    sql = "SELECT shelf, COUNT(*) AS book_count FROM books"
+    params: Tuple[Any, ...] = ()
+    if not is_admin:
+        sql += " WHERE user_id = ?"
+        params = (user_id,)
+    sql += " GROUP BY shelf"
+    counts = {shelf: 0 for shelf in SHELVES}
+    with get_cursor() as cur:
+        cur.execute(sql, params)
+        for row in cur.fetchall():
+            counts[row["shelf"]] = int(row["book_count"])
+    return counts
+
+
+def fetch_today_minutes(user: sqlite3.Row, today: date) -> float:
+    return _fetch_today_minutes_cached(int(user["id"]), user["role"] == "admin", today.isoformat(), _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_today_minutes_cached(user_id: int, is_admin: bool, day: str, version: int) -> float:
+    # Range predicate on the ISO text keeps idx_sessions_start_ts usable.
+    sql = """
+        SELECT COALESCE(SUM((julianday(end_ts) - julianday(start_ts)) * 1440.0), 0.0)
+        FROM sessions
+        WHERE start_ts >= ? AND start_ts < date(?, '+1 day')
+    """
+    params: Tuple[Any, ...] = (day, day)
+    if not is_admin:
+        sql += " AND user_id = ?"
+        params += (user_id,)
+    with get_cursor() as cur:
+        cur.execute(sql, params)
+        return float(cur.fetchone()[0])
+
+
+def fetch_monthly_stats(user: sqlite3.Row) -> pd.DataFrame:
+    return _fetch_monthly_stats_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_monthly_stats_cached(user_id: int, is_admin: bool, version: int) -> pd.DataFrame:
+    sql = """
+        SELECT
+            strftime('%Y-%m', start_ts) AS month,
+            SUM(COALESCE(pages_read, 0)) AS pages_read,
+            SUM((julianday(end_ts) - julianday(start_ts)) * 24.0) AS duration
+        FROM sessions
+    """
+    params: Tuple[Any, ...] = ()
+    if not is_admin:
+        sql += " WHERE user_id = ?"
+        params = (user_id,)
+    sql += " GROUP BY month ORDER BY month"
+    return fetch_df(sql, params)
 
 
 def fetch_quotes_for_sessions(user: sqlite3.Row, session_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
@@ -862,12 +1083,111 @@ def insert_session(
                 """,
                 (session_id, page, line or None, text or None, _utc_now()),
             )
-        return True
+    _bump()
+    return True
+
+
+def insert_sessions_bulk(user: sqlite3.Row, records: List[Tuple[Any, ...]]) -> int:
+    """Insert (book_id, start_ts, end_ts, pages_read, note, start_page, end_page, quote_page, quote_line, quote_text)
+    rows in one transaction, applying the same page clamping as insert_session."""
+    if not records:
+        return 0
+    with get_cursor() as cur:
+        if user["role"] == "admin":
+            cur.execute("SELECT id, user_id, current_page, total_pages FROM books")
+        else:
+            cur.execute("SELECT id, user_id, current_page, total_pages FROM books WHERE user_id = ?", (user["id"],))
+        books = {
+            int(row["id"]): {
+                "user_id": int(row["user_id"]),
+                "current_page": int(row["current_page"] or 0),
+                "total_pages": int(row["total_pages"]) if row["total_pages"] is not None else None,
+            }
+            for row in cur.fetchall()
+        }
+
+        now = _utc_now()
+        imported = 0
+        quote_rows: List[Tuple[Any, ...]] = []
+        touched: Dict[int, Dict[str, Any]] = {}
+        for book_id, start_ts, end_ts, pages_read, note, start_page, end_page, quote_page, quote_line, quote_text in records:
+            book = books.get(book_id)
+            if book is None:
+                continue
+            requested_pages = max(0, int(pages_read))
+            if book["total_pages"] is not None:
+                pages_logged = min(requested_pages, max(book["total_pages"] - book["current_page"], 0))
+            else:
+                pages_logged = requested_pages
+            book["current_page"] += pages_logged
+            touched[book_id] = book
+            line = quote_line.strip() or None
+            text = quote_text.strip() or None
+            cur.execute(
+                """
+                INSERT INTO sessions (
+                    user_id, book_id, start_ts, end_ts, start_page, end_page, pages_read, note, quote_page, quote_line, quote_text
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (book["user_id"], book_id, start_ts, end_ts, start_page, end_page, pages_logged, note, quote_page, line, text),
+            )
+            imported += 1
+            # lastrowid belongs to this cursor, so other writers on the shared connection can't leak in.
+            if quote_page is not None or line or text:
+                quote_rows.append((int(cur.lastrowid), quote_page, line, text, now))
+        if not imported:
+            return 0
+
+        cur.executemany(
+            "UPDATE books SET current_page = ? WHERE id = ?",
+            [(book["current_page"], book_id) for book_id, book in touched.items()],
+        )
+        cur.executemany(
+            """
+            INSERT INTO session_quotes (session_id, quote_page, quote_line, quote_text, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            quote_rows,
+        )
+    _bump()
+    return imported
+
+
+def export_books_csv(user: sqlite3.Row) -> bytes:
+    return _export_books_csv_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _export_books_csv_cached(user_id: int, is_admin: bool, version: int) -> bytes:
+    return _fetch_books_cached(user_id, is_admin, "title", version).to_csv(index=False).encode("utf-8")
+
+
+def export_sessions_csv(user: sqlite3.Row) -> bytes:
+    return _export_sessions_csv_cached(int(user["id"]), user["role"] == "admin", _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _export_sessions_csv_cached(user_id: int, is_admin: bool, version: int) -> bytes:
+    return b"".join(export_sessions_csv_iter(user_id, is_admin))
+
+
+def export_sessions_csv_iter(user_id: int, is_admin: bool, chunksize: int = 10_000) -> Iterator[bytes]:
+    """Yield the sessions CSV in chunks so only one chunk's DataFrame is alive at a time."""
+    sql, params = _sessions_query(user_id, is_admin, raw_timestamps=True)
+    chunks = pd.read_sql(sql, get_connection(), params=params, chunksize=chunksize)
+    for index, chunk in enumerate(chunks):
+        yield chunk.to_csv(index=False, header=index == 0).encode("utf-8")
 
 
 def fetch_goals(user: sqlite3.Row) -> Dict[str, Any]:
+    return _fetch_goals_cached(int(user["id"]), _db_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _fetch_goals_cached(user_id: int, version: int) -> Dict[str, Any]:
     with get_cursor() as cur:
-        cur.execute("SELECT * FROM goals WHERE user_id = ?", (user["id"],))
+        cur.execute("SELECT * FROM goals WHERE user_id = ?", (user_id,))
         row = cur.fetchone()
         if not row:
             return {"year": datetime.utcnow().year, "daily_minutes": 30, "yearly_books": 24}
@@ -875,29 +1195,84 @@ def fetch_goals(user: sqlite3.Row) -> Dict[str, Any]:
 
 
 def update_goals(user: sqlite3.Row, year: int, daily_minutes: int, yearly_books: int) -> None:
-    with get_cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO goals (user_id, year, daily_minutes, yearly_books)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET year = excluded.year,
-                                              daily_minutes = excluded.daily_minutes,
-                                              yearly_books = excluded.yearly_books
-            """,
-            (user["id"], year, daily_minutes, yearly_books),
-        )
+    execute(
+        """
+        INSERT INTO goals (user_id, year, daily_minutes, yearly_books)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET year = excluded.year,
+                                          daily_minutes = excluded.daily_minutes,
+                                          yearly_books = excluded.yearly_books
+        """,
+        (user["id"], year, daily_minutes, yearly_books),
+    )
+    _bump()
 
 
 def ensure_session_state():
     st.session_state.setdefault("active_session", None)
     st.session_state.setdefault("user_id", None)
     st.session_state.setdefault("session_quote_drafts", [])
+    st.session_state.setdefault("import_books_nonce", 0)
+    st.session_state.setdefault("import_sessions_nonce", 0)
 
 
 def rows_to_df(rows: List[sqlite3.Row]) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame()
-    return pd.DataFrame([dict(row) for row in rows])
+    return pd.DataFrame(rows, columns=rows[0].keys())
+
+
+def df_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _as_datetime(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    # Mixed column: some legacy timestamps came back as raw text from the converter.
+    # Parsing as UTC keeps naive and offset-bearing values comparable, then drops the zone.
+    return pd.to_datetime(series, errors="coerce", format="mixed", utc=True).dt.tz_localize(None)
+
+
+def _duration_minutes(df: pd.DataFrame) -> pd.Series:
+    return (_as_datetime(df["end_ts"]) - _as_datetime(df["start_ts"])).dt.total_seconds() / 60
+
+
+def _flash(message: str) -> None:
+    # Tabs render as fragments, so a write must rerun the whole app for the other tabs to see it.
+    st.session_state.flash_message = message
+    st.rerun()
+
+
+def show_flash() -> None:
+    message = st.session_state.pop("flash_message", None)
+    if message:
+        st.toast(message)
+
+
+@st.fragment(run_every=1)
+def _session_timer(label: str, start_ts: str) -> None:
+    delta = datetime.utcnow() - datetime.fromisoformat(start_ts)
+    st.info(f"Active session: {label} - {_format_elapsed(int(delta.total_seconds()))} elapsed.")
+
+
+def _csv_column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(pd.NA, index=df.index, dtype=object)
+
+
+def _csv_numeric(df: pd.DataFrame, name: str) -> pd.Series:
+    # Non-numeric and non-finite cells (e.g. "inf") both become NaN.
+    values = pd.to_numeric(_csv_column(df, name), errors="coerce")
+    return values.where(np.isfinite(values.astype(float)))
+
+
+def _csv_int_column(df: pd.DataFrame, name: str) -> List[Optional[int]]:
+    values = _csv_numeric(df, name)
+    return [None if pd.isna(value) else int(value) for value in values]
 
 
 def auth_gate(auth_info: Dict[str, Any]) -> Optional[sqlite3.Row]:
@@ -984,40 +1359,45 @@ def sidebar_account(user: sqlite3.Row) -> None:
         st.rerun()
 
 
+@st.fragment
 def library_tab(user: sqlite3.Row):
     st.subheader("Library")
-    books = fetch_books(user)
-    if not books:
+    shelf_counts = fetch_shelf_counts(user)
+    if not any(shelf_counts.values()):
         st.info("No books yet. Add one from the Add Book tab.")
         return
 
-    df = rows_to_df(books)
-    df["current_page"] = pd.to_numeric(df.get("current_page"), errors="coerce").fillna(0).astype(int)
-    df["total_pages"] = pd.to_numeric(df.get("total_pages"), errors="coerce")
-    df["pages_left"] = (df["total_pages"] - df["current_page"]).clip(lower=0)
-    df["progress_pct"] = (
-        (df["current_page"] / df["total_pages"].replace({0: pd.NA})) * 100
-    ).fillna(0).round(1)
-    shelf_counts = df["shelf"].value_counts().reindex(SHELVES, fill_value=0)
     cols = st.columns(len(SHELVES))
     for col, shelf in zip(cols, SHELVES):
-        col.metric(shelf.replace("_", " ").title(), int(shelf_counts[shelf]))
-
-    columns = ["title", "author", "isbn", "current_page", "total_pages", "pages_left", "progress_pct", "shelf", "added_at"]
-    if user["role"] == "admin":
-        columns.append("owner_email")
+        col.metric(shelf.replace("_", " ").title(), shelf_counts[shelf])
+
+    if st.toggle("Show table", key="library_show_table"):
+        df = fetch_books(user)
+        df["current_page"] = pd.to_numeric(df.get("current_page"), errors="coerce").fillna(0).astype(int)
+        df["total_pages"] = pd.to_numeric(df.get("total_pages"), errors="coerce")
+        df["pages_left"] = (df["total_pages"] - df["current_page"]).clip(lower=0)
+        df["progress_pct"] = (
+            (df["current_page"] / df["total_pages"].replace({0: pd.NA})) * 100
+        ).fillna(0).round(1)
+
+        columns = ["title", "author", "isbn", "current_page", "total_pages", "pages_left", "progress_pct", "shelf", "added_at"]
+        if user["role"] == "admin":
+            columns.append("owner_email")
 
-    st.dataframe(df[columns], use_container_width=True)
+        st.dataframe(df[columns], use_container_width=True)
 
     with st.expander("Edit or remove a book"):
-        book_options = {f"{b['title']} - {b['author']} ({b['owner_email']})": b for b in books}
+        book_options = book_label_index(user)
         selected = st.selectbox("Choose a book", list(book_options.keys()))
-        entry = book_options[selected]
+        entry = fetch_book_by_id(user, book_options[selected])
+        if not entry:
+            st.error("Selected book not found or inaccessible.")
+            return
         with st.form("edit-book"):
             title = st.text_input("Title", entry["title"])
             author = st.text_input("Author", entry["author"])
             isbn = st.text_input("ISBN", entry["isbn"] or "")
-            pages = st.number_input("Total pages", min_value=1, step=1, value=entry["total_pages"] or 1)
+            pages = st.number_input("Total pages", min_value=1, step=1, value=int(entry["total_pages"] or 1))
             shelf = st.selectbox("Shelf", SHELVES, index=SHELVES.index(entry["shelf"]))
             submitted = st.form_submit_button("Save changes")
             if submitted:
@@ -1027,13 +1407,13 @@ def library_tab(user: sqlite3.Row):
                     {"title": title.strip(), "author": author.strip(), "isbn": isbn.strip() or None, "total_pages": pages, "shelf": shelf},
                 )
                 if ok:
-                    st.success("Book updated. Refresh the tab to see changes.")
+                    _flash("Book updated.")
                 else:
                     st.error("Not allowed to update this book.")
         if st.button("Delete selected book"):
             ok = remove_book(user, entry["id"])
             if ok:
-                st.success("Book removed. Refresh the tab to see the latest list.")
+                _flash("Book removed.")
             else:
                 st.error("Not allowed to delete this book.")
 
@@ -1055,20 +1435,23 @@ def add_book_tab(user: sqlite3.Row):
                     user,
                     {"title": title.strip(), "author": author.strip(), "isbn": isbn.strip() or None, "total_pages": pages, "shelf": shelf},
                 )
-                st.success(f'Added "{title.strip()}".')
+                _flash(f'Added "{title.strip()}".')
 
 
+@st.fragment
 def session_tab(user: sqlite3.Row):
     ensure_session_state()
     st.subheader("Reading Session")
-    books = fetch_books(user, order_by="title")
-    if not books:
+    book_lookup = book_label_index(user)
+    if not book_lookup:
         st.info("Add a book first.")
         return
 
-    book_lookup = {f"{b['title']} - {b['author']} ({b['owner_email']})": b for b in books}
     selected_label = st.selectbox("Book", list(book_lookup.keys()))
-    book = book_lookup[selected_label]
+    book = fetch_book_by_id(user, book_lookup[selected_label])
+    if not book:
+        st.error("Selected book not found or inaccessible.")
+        return
     active = st.session_state.active_session
 
     selected_total_pages = int(book["total_pages"]) if book["total_pages"] is not None else None
@@ -1106,9 +1489,7 @@ def session_tab(user: sqlite3.Row):
             st.session_state.session_quote_drafts = []
             st.error("Active book not found or inaccessible.")
             st.rerun()
-        delta = datetime.utcnow() - datetime.fromisoformat(active["start_ts"])
-        elapsed_seconds = int(delta.total_seconds())
-        st.info(f"Active session: {active['label']} - {_format_elapsed(elapsed_seconds)} elapsed.")
+        _session_timer(active["label"], active["start_ts"])
         active_current_page = int(active_book["current_page"] or 0)
         active_total_pages = int(active_book["total_pages"]) if active_book["total_pages"] is not None else None
         active_next_page = active_current_page + 1
@@ -1205,20 +1586,16 @@ def session_tab(user: sqlite3.Row):
             st.session_state.active_session = None
             st.session_state.session_quote_drafts = []
             if ok:
-                st.success("Session saved.")
+                _flash("Session saved.")
             else:
                 st.error("Could not save session for this book.")
-        elif not add_quote_clicked and not remove_last_quote_clicked:
-            # Live ticker: refresh the page every second while a session is active.
-            time.sleep(1)
-            st.rerun()
 
     st.divider()
     st.caption("Recent sessions")
-    sessions = fetch_sessions(user, limit=10)
-    if sessions:
-        session_df = rows_to_df(sessions)
-        session_df["duration_min"] = (pd.to_datetime(session_df["end_ts"]) - pd.to_datetime(session_df["start_ts"])).dt.total_seconds() / 60
+    session_df = fetch_sessions(user, limit=10)
+    if not session_df.empty:
+        sessions = df_to_records(session_df)
+        session_df["duration_min"] = _duration_minutes(session_df)
         columns = [
             "title",
             "author",
@@ -1256,61 +1633,38 @@ def session_tab(user: sqlite3.Row):
         st.write("No sessions logged yet.")
 
 
+@st.fragment
 def stats_tab(user: sqlite3.Row):
     st.subheader("Stats & Insights")
-    books = fetch_books(user)
-    sessions = fetch_sessions(user)
-    total_books = len(books)
-    reading = len([b for b in books if b["shelf"] == "reading"])
-    df_sessions = rows_to_df(sessions)
-
-    total_hours = 0.0
-    total_pages = 0
-    if not df_sessions.empty:
-        durations = pd.to_datetime(df_sessions["end_ts"]) - pd.to_datetime(df_sessions["start_ts"])
-        total_hours = durations.dt.total_seconds().sum() / 3600
-        total_pages = int(df_sessions["pages_read"].sum())
+    totals = fetch_totals(user)
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Books in library", total_books)
-    c2.metric("Currently reading", reading)
-    c3.metric("Hours logged", f"{total_hours:.1f}")
-    c4.metric("Pages logged", total_pages)
+    c1.metric("Books in library", int(totals["books_count"]))
+    c2.metric("Currently reading", int(totals["reading_count"]))
+    c3.metric("Hours logged", f"{float(totals['hours_logged']):.1f}")
+    c4.metric("Pages logged", int(totals["pages_logged"]))
 
-    if df_sessions.empty:
+    if not totals["sessions_count"]:
         st.info("Start logging sessions to unlock charts.")
         return
 
-    df_sessions["month"] = pd.to_datetime(df_sessions["start_ts"]).dt.to_period("M").dt.to_timestamp()
-    monthly_pages = df_sessions.groupby("month")["pages_read"].sum().reset_index()
-    monthly_hours = (
-        df_sessions.assign(duration=lambda d: (pd.to_datetime(d["end_ts"]) - pd.to_datetime(d["start_ts"])).dt.total_seconds() / 3600)
-        .groupby("month")["duration"]
-        .sum()
-        .reset_index()
-    )
+    monthly = fetch_monthly_stats(user).set_index("month")
+    monthly_pages = monthly[["pages_read"]]
+    monthly_hours = monthly[["duration"]]
 
     st.markdown("**Pages by month**")
-    st.bar_chart(monthly_pages.set_index("month"))
+    st.bar_chart(monthly_pages)
     st.markdown("**Hours by month**")
-    st.line_chart(monthly_hours.set_index("month"))
+    st.line_chart(monthly_hours)
 
 
+@st.fragment
 def goals_tab(user: sqlite3.Row):
     st.subheader("Goals")
+    today = datetime.utcnow().date()
     goals = fetch_goals(user)
-    books = fetch_books(user)
-    sessions = fetch_sessions(user)
-
-    total_minutes_today = 0.0
-    today = pd.Timestamp.utcnow().date()
-    if sessions:
-        df = rows_to_df(sessions)
-        df["start_ts"] = pd.to_datetime(df["start_ts"])
-        today_sessions = df[df["start_ts"].dt.date == today]
-        total_minutes_today = ((pd.to_datetime(today_sessions["end_ts"]) - today_sessions["start_ts"]).dt.total_seconds().sum() / 60)
-
-    finished_books = len([b for b in books if b["shelf"] == "finished"])
+    total_minutes_today = fetch_today_minutes(user, today)
+    finished_books = int(fetch_totals(user)["finished_count"])
     st.metric("Today's minutes", f"{total_minutes_today:.0f}", f"Goal: {goals['daily_minutes']} minutes")
     st.metric("Books finished", finished_books, f"Goal: {goals['yearly_books']} this year")
 
@@ -1321,64 +1675,90 @@ def goals_tab(user: sqlite3.Row):
         submitted = st.form_submit_button("Save goals")
         if submitted:
             update_goals(user, int(year), int(daily_minutes), int(yearly_books))
-            st.success("Goals updated.")
+            _flash("Goals updated.")
 
 
+@st.fragment
 def settings_tab(user: sqlite3.Row):
     st.subheader("Settings & Data")
     st.write(f"Database path: `{DB_PATH}`")
-    books = rows_to_df(fetch_books(user))
-    sessions = rows_to_df(fetch_sessions(user))
+    totals = fetch_totals(user)
 
-    if not books.empty:
-        st.download_button("Export books CSV", data=books.to_csv(index=False), file_name="books_export.csv", mime="text/csv")
-    if not sessions.empty:
-        st.download_button("Export sessions CSV", data=sessions.to_csv(index=False), file_name="sessions_export.csv", mime="text/csv")
+    if totals["books_count"]:
+        st.download_button("Export books CSV", data=export_books_csv(user), file_name="books_export.csv", mime="text/csv")
+    if totals["sessions_count"]:
+        st.download_button("Export sessions CSV", data=export_sessions_csv(user), file_name="sessions_export.csv", mime="text/csv")
 
     st.markdown("### Import data")
-    import_books = st.file_uploader("Import books CSV", type="csv", key="import_books")
+    for message in st.session_state.pop("import_errors", []):
+        st.error(message)
+
+    # Each uploader is re-keyed via its nonce as soon as its file has been processed, which
+    # clears the file so a committed import can never run a second time.
+    imported_messages: List[str] = []
+    import_errors: List[str] = []
+    import_books = st.file_uploader(
+        "Import books CSV", type="csv", key=f"import_books_{st.session_state.import_books_nonce}"
+    )
     if import_books is not None:
-        df = pd.read_csv(import_books).fillna("")
-        imported = 0
-        for _, row in df.iterrows():
-            insert_book(
-                user,
-                {
-                    "title": row.get("title", "").strip() or "Untitled",
-                    "author": row.get("author", "").strip() or "Unknown",
-                    "isbn": str(row.get("isbn")) if row.get("isbn") else None,
-                    "total_pages": int(row.get("total_pages", 0) or 0) or None,
-                    "current_page": int(row.get("current_page", 0) or 0),
-                    "shelf": row.get("shelf") if row.get("shelf") in SHELVES else "to_read",
-                },
+        try:
+            df = pd.read_csv(import_books)
+            total_pages = _csv_numeric(df, "total_pages").fillna(0).astype(int)
+            current_page = _csv_numeric(df, "current_page").fillna(0).astype(int).clip(lower=0)
+            current_page = current_page.where((total_pages <= 0) | (current_page <= total_pages), total_pages)
+            isbn = _csv_column(df, "isbn").fillna("").astype(str).str.strip()
+            shelf = _csv_column(df, "shelf")
+            records = list(
+                zip(
+                    [int(user["id"])] * len(df),
+                    _csv_column(df, "title").fillna("").astype(str).str.strip().replace("", "Untitled").tolist(),
+                    _csv_column(df, "author").fillna("").astype(str).str.strip().replace("", "Unknown").tolist(),
+                    isbn.astype(object).where(isbn != "", None).tolist(),
+                    total_pages.astype(object).where(total_pages > 0, None).tolist(),
+                    current_page.tolist(),
+                    shelf.where(shelf.isin(SHELVES), "to_read").tolist(),
+                    [_utc_now()] * len(df),
+                )
             )
-            imported += 1
-        st.success(f"Imported {imported} books.")
-
-    import_sessions = st.file_uploader("Import sessions CSV", type="csv", key="import_sessions")
+            imported = insert_books_bulk(records)
+            imported_messages.append(f"Imported {imported} books.")
+        except ValueError as exc:
+            import_errors.append(f"Could not import books CSV: {exc}")
+        finally:
+            st.session_state.import_books_nonce += 1
+
+    import_sessions = st.file_uploader(
+        "Import sessions CSV", type="csv", key=f"import_sessions_{st.session_state.import_sessions_nonce}"
+    )
     if import_sessions is not None:
-        df = pd.read_csv(import_sessions)
-        imported = 0
-        for _, row in df.iterrows():
-            try:
-                ok = insert_session(
-                    user,
-                    int(row["book_id"]),
-                    row["start_ts"],
-                    row["end_ts"],
-                    int(row.get("pages_read", 0)),
-                    row.get("note", ""),
-                    start_page=(int(row["start_page"]) if "start_page" in row and pd.notna(row["start_page"]) else None),
-                    end_page=(int(row["end_page"]) if "end_page" in row and pd.notna(row["end_page"]) else None),
-                    quote_page=(int(row["quote_page"]) if "quote_page" in row and pd.notna(row["quote_page"]) else None),
-                    quote_line=(str(row["quote_line"]) if "quote_line" in row and pd.notna(row["quote_line"]) else ""),
-                    quote_text=(str(row["quote_text"]) if "quote_text" in row and pd.notna(row["quote_text"]) else ""),
+        try:
+            df = pd.read_csv(import_sessions)
+            df = df.assign(book_id=_csv_numeric(df, "book_id"))
+            df = df[df["book_id"].notna() & _csv_column(df, "start_ts").notna() & _csv_column(df, "end_ts").notna()]
+            records = list(
+                zip(
+                    df["book_id"].astype(int).tolist(),
+                    _csv_column(df, "start_ts").astype(str).tolist(),
+                    _csv_column(df, "end_ts").astype(str).tolist(),
+                    _csv_numeric(df, "pages_read").fillna(0).astype(int).tolist(),
+                    _csv_column(df, "note").fillna("").astype(str).tolist(),
+                    _csv_int_column(df, "start_page"),
+                    _csv_int_column(df, "end_page"),
+                    _csv_int_column(df, "quote_page"),
+                    _csv_column(df, "quote_line").fillna("").astype(str).tolist(),
+                    _csv_column(df, "quote_text").fillna("").astype(str).tolist(),
                 )
-                if ok:
-                    imported += 1
-            except Exception:
-                continue
-        st.success(f"Imported {imported} sessions.")
+            )
+            imported = insert_sessions_bulk(user, records)
+            imported_messages.append(f"Imported {imported} sessions.")
+        except ValueError as exc:
+            import_errors.append(f"Could not import sessions CSV: {exc}")
+        finally:
+            st.session_state.import_sessions_nonce += 1
+
+    if imported_messages or import_errors:
+        st.session_state.import_errors = import_errors
+        _flash(" ".join(imported_messages) or "Import failed.")
 
 
 def admin_tab(user: sqlite3.Row):
@@ -1448,9 +1828,7 @@ def admin_tab(user: sqlite3.Row):
         if sessions_df.empty:
             st.write("No sessions for this user.")
         else:
-            sessions_df["duration_min"] = (
-                pd.to_datetime(sessions_df["end_ts"]) - pd.to_datetime(sessions_df["start_ts"])
-            ).dt.total_seconds() / 60
+            sessions_df["duration_min"] = _duration_minutes(sessions_df)
             st.dataframe(
                 sessions_df[
                     [
@@ -1519,6 +1897,7 @@ def main():
         return
 
     sidebar_account(user)
+    show_flash()
 
     labels = ["Library", "Add Book", "Session", "Stats", "Goals", "Settings"]
     if user["role"] == "admin":